@@ -1,16 +1,14 @@
 #!/usr/bin/env python3
 
-from garmin_fit_sdk import Stream, Decoder
+from debug_cache import decode_cached
 
 # Debug the filtered_bpm issue specifically
-stream = Stream.from_file('tests/fits/HrmPluginTestActivity.fit')
-decoder = Decoder(stream)
-messages, errors = decoder.read(preserve_invalid_values=True, merge_heart_rates=False, expand_sub_fields=False, expand_components=False)
+messages, errors = decode_cached('tests/fits/HrmPluginTestActivity.fit', preserve_invalid_values=True, merge_heart_rates=False, expand_sub_fields=False, expand_components=False)
 
 print("Looking for hr_mesgs and filtered_bpm field...")
 
-if 'hr_mesgs' in messages:
-    hr_messages = messages['hr_mesgs']
+hr_messages = messages.get('hr_mesgs')
+if hr_messages is not None:
     print(f"Found {len(hr_messages)} HR messages")
     
     for i, hr_msg in enumerate(hr_messages):
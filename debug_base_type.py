@@ -1,33 +1,40 @@
 #!/usr/bin/env python3
-from garmin_fit_sdk import Stream, Decoder, BASE_TYPE_DEFINITIONS
+import mmap
+import sys
+
+from garmin_fit_sdk import BASE_TYPE_DEFINITIONS
+
+from debug_cache import decode_cached
+from debug_diff import format_byte_window
+
+ENCODED_FILE = 'debug_encoded.fit'  # Written by debug_encode.py
 
 # Check what base types are valid
-print("Valid FIT base types:")
+out = ["Valid FIT base types:"]
 for base_type_val, base_type_info in BASE_TYPE_DEFINITIONS.items():
-    print(f"  {base_type_val}: {base_type_info}")
+    out.append(f"  {base_type_val}: {base_type_info}")
+sys.stdout.write('\n'.join(out) + '\n')
 
 print("\nDecoding encoded file to find invalid base type...")
-stream = Stream.from_file('/tmp/tmp57dwtluw/encoded_HrmPluginTestActivity.fit')
-decoder = Decoder(stream)
-
 try:
-    messages, errors = decoder.read()
+    # Shares the decode with debug_decode.py through debug_cache
+    messages, errors = decode_cached(ENCODED_FILE)
     print(f"Decoding successful: {len(messages)} messages, {len(errors)} errors")
 except Exception as e:
     print(f"Decoding failed: {e}")
     
     # Manual investigation of the file at byte 18095
-    with open('/tmp/tmp57dwtluw/encoded_HrmPluginTestActivity.fit', 'rb') as f:
-        f.seek(18090)  # Read around the error location
-        data = f.read(20)
-        print(f"Bytes around 18095: {data.hex()}")
+    with open(ENCODED_FILE, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        data = mm[18090:18110]  # Read around the error location
+        out = ["Bytes around 18095:", format_byte_window(data, 18090, marked=18095).rstrip('\n')]
+        
+        # Check the suspect byte
+        if len(data) > 18095 - 18090:
+            byte = data[18095 - 18090]
+            if byte in BASE_TYPE_DEFINITIONS:
+                out.append(f"    This is a valid base type: {BASE_TYPE_DEFINITIONS[byte]}")
+            else:
+                out.append(f"    This is NOT a valid base type!")
         
-        # Check individual bytes
-        for i, byte in enumerate(data):
-            print(f"  Byte {18090 + i}: {byte} (0x{byte:02x})")
-            if 18090 + i == 18095:
-                print(f"    *** ERROR BYTE {18095}: {byte} ***")
-                if byte in BASE_TYPE_DEFINITIONS:
-                    print(f"    This is a valid base type: {BASE_TYPE_DEFINITIONS[byte]}")
-                else:
-                    print(f"    This is NOT a valid base type!")
\ No newline at end of file
+        sys.stdout.write('\n'.join(out) + '\n')
\ No newline at end of file
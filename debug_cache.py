@@ -0,0 +1,50 @@
+'''debug_cache.py: Caches decoded FIT messages so repeated debug passes skip the decode, and round-trips them in memory.'''
+
+import os
+
+from garmin_fit_sdk import Decoder, Encoder, Stream
+
+_decode_cache = {}  # (path, mtime_ns, size, read kwargs) -> (messages, errors)
+
+
+def decode_cached(path, **kwargs):
+    '''
+    Decodes a FIT file, reusing the result of an earlier decode of the same file.
+
+    Results are kept in memory for the current process only, so every debug run
+    decodes with the SDK sources it was started with. The cache key includes the
+    file's modification time in nanoseconds, its size and the read options, so a
+    rewritten file or different decode options always trigger a fresh decode.
+    Callers share the returned messages and must not mutate them.
+
+    Args:
+        path: Path to the FIT file
+        **kwargs: Options passed through to Decoder.read()
+
+    Returns:
+        tuple: (messages, errors) as returned by Decoder.read()
+    '''
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size, tuple(sorted(kwargs.items())))
+    result = _decode_cache.get(key)
+    if result is None:
+        stream = Stream.from_file(path)
+        result = Decoder(stream).read(**kwargs)
+        _decode_cache[key] = result
+
+    return result
+
+
+def roundtrip(messages, **kwargs):
+    '''
+    Encodes messages and decodes the result again without touching the filesystem.
+
+    Args:
+        messages: Messages to encode, as returned by Decoder.read()
+        **kwargs: Options passed through to Decoder.read()
+
+    Returns:
+        tuple: (messages, errors) decoded from the encoded bytes
+    '''
+    encoded = Encoder(messages).write_to_bytes()
+    return Decoder(Stream.from_byte_array(encoded)).read(**kwargs)
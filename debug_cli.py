@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+'''
+debug_cli.py: Runs the debug scripts from a single Python process.
+
+Each debug script imports garmin_fit_sdk (and with it the full Profile) and decodes the
+same test file. Running them through this dispatcher pays the import once and shares
+decoded messages between scripts through debug_cache. Each script's output, including the
+encoder's debug prints, is collected in memory and written out in one go when it finishes.
+
+Usage:
+    python3 debug_cli.py <command> [<command> ...]
+    python3 debug_cli.py all
+'''
+
+import argparse
+import io
+import os
+import runpy
+import sys
+import traceback
+from contextlib import contextmanager
+
+import garmin_fit_sdk  # noqa: F401  Loaded once for every script run below
+
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+COMMANDS = {
+    'array': 'debug_array_issue.py',
+    'base-type': 'debug_base_type.py',
+    'decode': 'debug_decode.py',
+    'encode': 'debug_encode.py',
+    'field-104': 'debug_field_104.py',
+    'preanalysis': 'debug_preanalysis.py',
+    'structure': 'debug_structure.py',
+}
+
+
+@contextmanager
+def buffered_stdout():
+    '''Collects everything printed inside the block and writes it to stdout once on exit.'''
+    stdout = sys.stdout
+    sys.stdout = buffer = io.StringIO()
+    try:
+        yield
+    finally:
+        sys.stdout = stdout
+        stdout.write(buffer.getvalue())
+        stdout.flush()
+
+
+def run_command(command):
+    '''
+    Runs one debug script as __main__ in this process.
+
+    Returns:
+        bool: True if the script ran without raising
+    '''
+    script = COMMANDS[command]
+    print(f"=== {command} ({script}) ===")
+    try:
+        with buffered_stdout():
+            runpy.run_path(os.path.join(_SCRIPT_DIR, script), run_name='__main__')
+    except Exception:
+        traceback.print_exc()
+        return False
+
+    return True
+
+
+def main(argv=None):
+    '''Parses the command line and runs the requested debug scripts in order.'''
+    parser = argparse.ArgumentParser(description="Run FIT debug scripts in a single process")
+    parser.add_argument('commands', nargs='+', choices=sorted(COMMANDS) + ['all'],
+                        help="debug scripts to run, or 'all' for every script")
+    args = parser.parse_args(argv)
+
+    commands = list(COMMANDS) if 'all' in args.commands else args.commands
+    failures = [command for command in commands if not run_command(command)]
+    if failures:
+        print(f"Failed: {', '.join(failures)}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
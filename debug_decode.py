@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
-from garmin_fit_sdk import Stream, Decoder, BASE_TYPE_DEFINITIONS
+import mmap
+import sys
 
-# Now try to decode the file to see exactly where the error occurs
+from garmin_fit_sdk import BASE_TYPE_DEFINITIONS
+
+from debug_cache import decode_cached
+from debug_diff import first_file_difference, format_byte_window
+
+# Now try to decode the file to see exactly where the error occurs. The cache is keyed
+# on the file's mtime and size, so a fresh debug_encode.py run is always re-decoded.
 try:
-    stream = Stream.from_file('debug_encoded.fit')
-    decoder = Decoder(stream)
-    messages, errors = decoder.read()
+    messages, errors = decode_cached('debug_encoded.fit')
     print(f"Decoding successful: {len(messages)} messages, {len(errors)} errors")
     if errors:
         print(f"Errors: {errors}")
@@ -19,12 +24,19 @@ print(f"Base type 71 hex: 0x{71:02x}")
 
 # Let's also compare with the original file structure at this location
 print("\nOriginal file at same location:")
-with open('tests/fits/HrmPluginTestActivity.fit', 'rb') as f:
-    f.seek(18090)
-    data = f.read(20)
-    print(f"Original bytes around 18095: {data.hex()}")
-    
-    for i, byte in enumerate(data):
-        print(f"  Byte {18090 + i}: {byte} (0x{byte:02x})")
-        if 18090 + i == 18095:
-            print(f"    *** ORIGINAL BYTE {18095}: {byte} ***")
\ No newline at end of file
+with open('tests/fits/HrmPluginTestActivity.fit', 'rb') as f, \
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+    data = mm[18090:18110]
+    sys.stdout.write(format_byte_window(data, 18090, marked=18095, label='ORIGINAL'))
+
+# Locate where the encoded file first diverges from the original
+offset = first_file_difference('tests/fits/HrmPluginTestActivity.fit', 'debug_encoded.fit')
+if offset is None:
+    print("\nEncoded file is identical to the original")
+else:
+    # Only the bytes around the difference are read for display
+    with open('tests/fits/HrmPluginTestActivity.fit', 'rb') as f1, open('debug_encoded.fit', 'rb') as f2:
+        f1.seek(offset)
+        f2.seek(offset)
+        print(f"\nFirst difference at byte {offset}: "
+              f"original {f1.read(8).hex(' ', 1)} vs encoded {f2.read(8).hex(' ', 1)}")
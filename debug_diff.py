@@ -0,0 +1,133 @@
+'''debug_diff.py: Element-wise comparison of original and round-tripped field values.'''
+
+import mmap
+import os
+from itertools import zip_longest
+from numbers import Number
+
+
+class _Missing:
+    '''Stands in for an element one sequence has and the other does not.'''
+
+    def __repr__(self):
+        return '<missing>'
+
+
+MISSING = _Missing()
+
+
+def diff_report(original, roundtrip, rtol=0.0):
+    '''
+    Compares two sequences of field values element by element in a single pass.
+
+    Numeric pairs are compared with a relative tolerance; anything else (None,
+    strings, nested lists) must compare equal. If one sequence is longer, each of its
+    extra elements is a mismatch against MISSING.
+
+    Args:
+        original: Values decoded from the original file
+        roundtrip: Values decoded from the re-encoded file
+        rtol: Relative tolerance for numeric values
+
+    Returns:
+        list: (index, original_value, roundtrip_value, abs_diff, rel_diff) tuples for
+        every mismatching element. abs_diff and rel_diff are None for non-numeric pairs
+        and missing elements.
+    '''
+    mismatches = []
+    for i, (a, b) in enumerate(zip_longest(original, roundtrip, fillvalue=MISSING)):
+        if a == b:
+            continue
+
+        if isinstance(a, Number) and isinstance(b, Number):
+            abs_diff = abs(a - b)
+            rel_diff = abs_diff / abs(b) if b else float('inf')
+            if rel_diff <= rtol:
+                continue
+            mismatches.append((i, a, b, abs_diff, rel_diff))
+        else:
+            mismatches.append((i, a, b, None, None))
+
+    return mismatches
+
+
+def first_byte_difference(original, encoded, block_size=65536):
+    '''
+    Finds the first offset at which two byte buffers differ.
+
+    The buffers are compared one block at a time, so for mmap inputs only a block of
+    each file is ever copied onto the heap. Within the first differing block the range
+    is halved until one byte remains; every comparison is a C-level memcmp of two
+    slices instead of a Python-level loop over every byte.
+
+    Args:
+        original: bytes, bytearray or mmap of the original file
+        encoded: bytes, bytearray or mmap of the re-encoded file
+        block_size: Number of bytes compared per step
+
+    Returns:
+        int: Offset of the first differing byte, the shorter length if one buffer is a
+        prefix of the other, or None if the buffers are identical.
+    '''
+    min_len = min(len(original), len(encoded))
+    for start in range(0, min_len, block_size):
+        end = min(start + block_size, min_len)
+        original_block = original[start:end]
+        encoded_block = encoded[start:end]
+        if original_block == encoded_block:
+            continue
+
+        # Invariant: the first difference lies in [low, high) of the block
+        low, high = 0, end - start
+        while high - low > 1:
+            mid = (low + high) // 2
+            if original_block[low:mid] == encoded_block[low:mid]:
+                low = mid
+            else:
+                high = mid
+
+        return start + low
+
+    return None if len(original) == len(encoded) else min_len
+
+
+def first_file_difference(original_path, encoded_path, block_size=65536):
+    '''
+    Finds the first offset at which two files differ without reading either into memory.
+
+    Returns:
+        int: As for first_byte_difference
+    '''
+    with open(original_path, 'rb') as original_file, open(encoded_path, 'rb') as encoded_file:
+        # mmap cannot map empty files
+        if os.fstat(original_file.fileno()).st_size == 0 or os.fstat(encoded_file.fileno()).st_size == 0:
+            return first_byte_difference(original_file.read(), encoded_file.read(), block_size)
+
+        with mmap.mmap(original_file.fileno(), 0, access=mmap.ACCESS_READ) as original, \
+                mmap.mmap(encoded_file.fileno(), 0, access=mmap.ACCESS_READ) as encoded:
+            return first_byte_difference(original, encoded, block_size)
+
+
+def format_byte_window(data, start, marked=None, label='ERROR', row_size=16):
+    '''
+    Formats a window of bytes as an offset-prefixed hex table.
+
+    The whole table is built as one string so callers emit it with a single write,
+    rather than formatting and printing one line per byte.
+
+    Args:
+        data: Bytes read from the file
+        start: File offset of data[0]
+        marked: Optional file offset to call out below the table
+        label: Label used for the marked byte
+
+    Returns:
+        str: The table, one row per row_size bytes, ending in a newline
+    '''
+    lines = [f"  {start + row:8d}: {data[row:row + row_size].hex(' ', 1)}"
+             for row in range(0, len(data), row_size)]
+    if marked is not None and start <= marked < start + len(data):
+        byte = data[marked - start]
+        lines.append(f"    *** {label} BYTE {marked}: {byte} (0x{byte:02x}) ***")
+
+    return '\n'.join(lines) + '\n'
@@ -1,13 +1,13 @@
 #!/usr/bin/env python3
 import os
-from garmin_fit_sdk import Stream, Decoder, Encoder
+import sys
+from garmin_fit_sdk import Encoder
+from debug_cache import decode_cached
+from debug_diff import format_byte_window
 
-# Decode the original file
-original_stream = Stream.from_file('tests/fits/HrmPluginTestActivity.fit')
-original_decoder = Decoder(original_stream)
-
-# Decode with non-expansion settings to match test
-original_messages, original_errors = original_decoder.read(
+# Decode the original file with non-expansion settings to match test
+original_messages, original_errors = decode_cached(
+    'tests/fits/HrmPluginTestActivity.fit',
     preserve_invalid_values=True,
     merge_heart_rates=False,
     expand_sub_fields=False,
@@ -21,19 +21,22 @@ encoder = Encoder(original_messages)
 output_file = 'debug_encoded.fit'
 result = encoder.write_to_file(output_file)
 
+# One stat() answers both whether the file exists and how big it is
+try:
+    output_size = os.stat(output_file).st_size
+    output_exists = True
+except FileNotFoundError:
+    output_size = 0
+    output_exists = False
+
 print(f"Encoding result: {result}")
-print(f"Output file exists: {os.path.exists(output_file)}")
-print(f"Output file size: {os.path.getsize(output_file) if os.path.exists(output_file) else 0} bytes")
+print(f"Output file exists: {output_exists}")
+print(f"Output file size: {output_size} bytes")
 
 # Now let's manually inspect the file at byte 18095
-if os.path.exists(output_file):
+if output_exists:
     with open(output_file, 'rb') as f:
         f.seek(18090)  # Read around the error location
         data = f.read(20)
-        print(f"\nBytes around 18095: {data.hex()}")
-        
-        # Check individual bytes
-        for i, byte in enumerate(data):
-            print(f"  Byte {18090 + i}: {byte} (0x{byte:02x})")
-            if 18090 + i == 18095:
-                print(f"    *** ERROR BYTE {18095}: {byte} ***")
\ No newline at end of file
+        print("\nBytes around 18095:")
+        sys.stdout.write(format_byte_window(data, 18090, marked=18095))
\ No newline at end of file
@@ -1,13 +1,13 @@
 #!/usr/bin/env python3
 import os
-from garmin_fit_sdk import Stream, Decoder, Encoder
+from itertools import chain
 
-# Decode the original file
-original_stream = Stream.from_file('tests/fits/HrmPluginTestActivity.fit')
-original_decoder = Decoder(original_stream)
+from garmin_fit_sdk import Encoder
+from debug_cache import decode_cached
 
-# Decode with non-expansion settings to match test
-original_messages, original_errors = original_decoder.read(
+# Decode the original file with non-expansion settings to match test
+original_messages, original_errors = decode_cached(
+    'tests/fits/HrmPluginTestActivity.fit',
     preserve_invalid_values=True,
     merge_heart_rates=False,
     expand_sub_fields=False,
@@ -19,10 +19,8 @@ print(f"Original decoding: {len(original_messages)} messages, {len(original_erro
 # Create encoder to test pre-analysis
 encoder = Encoder(original_messages)
 
-# Test the pre-analysis method directly
-all_messages = []
-for messages in encoder._messages.values():
-    all_messages.extend(messages)
+# Test the pre-analysis method directly, feeding it messages the same way _write_messages does
+all_messages = chain.from_iterable(encoder._messages.values())
 
 field_defs = encoder._analyze_field_types_across_messages(all_messages)
 
@@ -38,13 +36,14 @@ for field_name, analysis in field_defs.items():
         
 print(f"\nTotal field definitions analyzed: {len(field_defs)}")
 
-# Look at HR messages specifically
-hr_messages = [msg for msg in all_messages if msg.get('mesg_num') == 132]  # HR message type
+# Look at HR messages specifically. Decoded messages carry no mesg_num, so take them
+# straight from their messages key instead of filtering every message in the file.
+hr_messages = encoder._messages.get('hr_mesgs', [])
 print(f"\nFound {len(hr_messages)} HR messages")
 
 for i, msg in enumerate(hr_messages[:5]):  # Show first 5
-    if 'fields' in msg and 104 in msg['fields']:
-        filtered_bpm = msg['fields'][104]
+    filtered_bpm = msg.get('filtered_bpm')
+    if filtered_bpm is not None:
         print(f"  HR message {i}: filtered_bpm = {filtered_bpm}, type = {type(filtered_bpm)}")
     else:
         print(f"  HR message {i}: no filtered_bpm field")
\ No newline at end of file
@@ -1,12 +1,9 @@
 #!/usr/bin/env python3
-from garmin_fit_sdk import Stream, Decoder
+from debug_cache import decode_cached
 
-# Decode the original file
-original_stream = Stream.from_file('tests/fits/HrmPluginTestActivity.fit')
-original_decoder = Decoder(original_stream)
-
-# Decode with non-expansion settings to match test
-original_messages, original_errors = original_decoder.read(
+# Decode the original file with non-expansion settings to match test
+original_messages, original_errors = decode_cached(
+    'tests/fits/HrmPluginTestActivity.fit',
     preserve_invalid_values=True,
     merge_heart_rates=False,
     expand_sub_fields=False,
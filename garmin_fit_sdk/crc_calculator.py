@@ -18,6 +18,16 @@ _CRC_TABLE = [
 ]
 
 
+def _byte_crc(value):
+    '''Returns the CRC of a single byte starting from zero, using the four bit table.'''
+    crc = _CRC_TABLE[value & 0xF]
+    return ((crc >> 4) & 0x0FFF) ^ _CRC_TABLE[crc & 0xF] ^ _CRC_TABLE[(value >> 4) & 0xF]
+
+
+# Byte at a time table derived from _CRC_TABLE, so each byte costs one lookup instead of four
+_CRC_BYTE_TABLE = tuple(_byte_crc(value) for value in range(256))
+
+
 class CrcCalculator:
     '''A class for calculating the CRC of a given .fit file header or file contents.'''
 
@@ -29,24 +39,19 @@ class CrcCalculator:
         '''Returns the calculated CRC value.'''
         return self._crc
 
-    def __update_crc(self, value):
-        # compute checksum of lower four bits of byte
-        temp = _CRC_TABLE[self._crc & 0xF]
-        self._crc = (self._crc >> 4) & 0x0FFF
-        self._crc = self._crc ^ temp ^ _CRC_TABLE[value & 0xF]
-
-        # compute checksum of upper four bits of byte
-        temp = _CRC_TABLE[self._crc & 0xF]
-        self._crc = (self._crc >> 4) & 0x0FFF
-        self._crc = self._crc ^ temp ^ _CRC_TABLE[(value >> 4) & 0xF]
-
-        return self._crc
-
     def add_bytes(self, buffer, start, end):
         '''Adds another chunk of bytes for calculating the CRC.'''
-        for i in range(start, end):
-            self._crc = self.__update_crc(buffer[i])
-            self._bytes_seen += 1
+        # The running CRC is kept in a local and the per-byte update is inlined, since
+        # this loop runs once for every byte of a file being decoded or encoded. Iterating
+        # the sliced copy is faster than iterating a memoryview, and two bytes per step
+        # through a 64K entry table is no faster than one byte through the 256 entry table
+        crc = self._crc
+        table = _CRC_BYTE_TABLE
+        for value in buffer[start:end]:
+            crc = (crc >> 8) ^ table[(crc ^ value) & 0xFF]
+
+        self._crc = crc
+        self._bytes_seen += max(end - start, 0)
 
         return self._crc
 
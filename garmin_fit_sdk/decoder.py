@@ -31,6 +31,10 @@ _DEV_DATA_MASK = 0x20
 _HEADER_WITH_CRC_SIZE = 14
 _HEADER_WITHOUT_CRC_SIZE = 12
 
+# Profile tables bound once, so hot paths pay one hash per lookup rather than one per level
+_PROFILE_MESSAGES = Profile['messages']
+_PROFILE_TYPES = Profile['types']
+
 DecodeMode = Enum('DecodeMode', ['NORMAL', 'SKIP_HEADER', 'DATA_ONLY'])
 
 class Decoder:
@@ -90,12 +94,18 @@ class Decoder:
 
         return True
 
-    def check_integrity(self):
-        '''Returns whether the integrity of the file is good or not.'''
+    def check_header_integrity(self):
+        '''
+        Returns whether the file header and declared file size are good, without reading
+        the file data.
+
+        read() verifies the file CRC as it decodes, so a caller that goes on to read the
+        file can use this in place of check_integrity() and walk the data only once.
+        '''
         try:
             if self.is_fit() is False:
                 return False
-            
+
             file_header = self.read_file_header(True)
 
             if file_header.header_size + file_header.data_size + _CRCSIZE > self._stream.get_length():
@@ -104,6 +114,19 @@ class Decoder:
             if file_header.header_size is _HEADER_WITH_CRC_SIZE and file_header.header_crc != CrcCalculator.calculate_crc(self._stream.slice(0, 12), 0, 12):
                 return False
 
+        except Exception:
+            return False
+
+        return True
+
+    def check_integrity(self):
+        '''Returns whether the integrity of the file is good or not.'''
+        try:
+            if self.check_header_integrity() is False:
+                return False
+            
+            file_header = self.read_file_header(True)
+
             file_crc = CrcCalculator.calculate_crc(self._stream.read_bytes(file_header.file_total_size),0, file_header.file_total_size)
             crc_from_file = self._stream.read_byte() + (self._stream.read_byte() << 8)
             if crc_from_file != file_crc:
@@ -253,9 +276,8 @@ class Decoder:
                 mesg_def["developer_field_defs"].append(developer_field_definition)
                 mesg_def["developer_data_size"] += developer_field_definition["size"]
 
-        if mesg_def["global_mesg_num"] in Profile['messages']:
-            message_profile = Profile['messages'][mesg_def["global_mesg_num"]]
-        else:
+        message_profile = _PROFILE_MESSAGES.get(mesg_def["global_mesg_num"])
+        if message_profile is None:
             message_profile = {
                 "name": str(mesg_def["global_mesg_num"]),
                 "messages_key": str(mesg_def["global_mesg_num"]),
@@ -340,15 +362,21 @@ class Decoder:
         message = {}
         raw_values = self.__read_raw_values(mesg_def["message_size"], mesg_def["struct_format_string"])
 
+        # Bind loop-invariant lookups once per message rather than once per field
+        base_type_definitions = FIT.BASE_TYPE_DEFINITIONS
+        profile_fields = mesg_def['fields']
+        string_type = FIT.BASE_TYPE["STRING"]
+        byte_type = FIT.BASE_TYPE["BYTE"]
+
         index = 0
         for field in mesg_def['field_definitions']:
-            base_type_definition = FIT.BASE_TYPE_DEFINITIONS[field["base_type"]]
+            base_type_definition = base_type_definitions[field["base_type"]]
             invalid = base_type_definition["invalid"]
             num_elements = field["num_field_elements"]
 
             field_id = field["field_id"]
-            field_profile = mesg_def['fields'][field_id] if field_id in mesg_def['fields'] else None
-            field_name = field_profile['name'] if field_id in mesg_def['fields'] else field_id
+            field_profile = profile_fields.get(field_id)
+            field_name = field_profile['name'] if field_profile is not None else field_id
 
             if field_profile is not None and 'has_components' in field_profile:
                 convert_invalids_to_none = not field_profile['has_components'] and not self._preserve_invalid_values
@@ -358,14 +386,14 @@ class Decoder:
             field_value = None
 
             # Fields with strings or string arrays
-            if base_type_definition['type'] == FIT.BASE_TYPE["STRING"]:
+            if base_type_definition['type'] == string_type:
                 field_value = util._convert_string(raw_values[index])
 
             # Fields with an array of values
             elif num_elements > 1:
                 field_value = []
 
-                if(base_type_definition['type'] == FIT.BASE_TYPE["BYTE"]):
+                if(base_type_definition['type'] == byte_type):
                     raw_array = raw_values[index : index + num_elements]
                     field_value = raw_array if util._only_invalid_values(raw_array, invalid) is False else None
                 else:
@@ -396,7 +424,7 @@ class Decoder:
                 if field_profile and field_profile['is_accumulated'] is True:
                     self.__set_accumulated_value(mesg_def, message, field_profile, field_value)
 
-            index += num_elements if base_type_definition['type'] != FIT.BASE_TYPE["STRING"] else 1
+            index += num_elements if base_type_definition['type'] != string_type else 1
 
         return message
 
@@ -525,11 +553,12 @@ class Decoder:
         if self._expand_sub_fields is False or len(self._fields_with_subfields) == 0:
             return
 
+        profile_fields = _PROFILE_MESSAGES[global_mesg_num]['fields']
+
         # Save the original fields for iteration before expanding sub fields.
         for field in self._fields_with_subfields:
-            if message[field]['field_definition_number'] in Profile['messages'][global_mesg_num]['fields']:
-                field_profile = Profile['messages'][global_mesg_num]['fields'][message[field]['field_definition_number']]
-            else:
+            field_profile = profile_fields.get(message[field]['field_definition_number'])
+            if field_profile is None:
                 continue
 
             if len(field_profile['sub_fields']) > 0:
@@ -571,19 +600,18 @@ class Decoder:
 
     def __convert_type_to_string(self, field_type, raw_field_value):
         try:
-            if field_type in Profile['types']:
-                types = Profile['types'][field_type]
-            else:
+            types = _PROFILE_TYPES.get(field_type)
+            if types is None:
                 return raw_field_value
 
             field_value = raw_field_value
 
             if isinstance(raw_field_value, list):
                 for i in range(len(raw_field_value)):
-                    field_value[i] = types[str(raw_field_value[i])] if str(raw_field_value[i]) in types else raw_field_value[i]
+                    field_value[i] = types.get(str(raw_field_value[i]), raw_field_value[i])
                 return field_value
 
-            return types[str(raw_field_value)] if str(raw_field_value) in types else field_value
+            return types.get(str(raw_field_value), field_value)
         except Exception:
             return raw_field_value
 
@@ -2,11 +2,120 @@
 
 import struct
 import datetime
+from collections import defaultdict
+from itertools import chain
 from . import CrcCalculator
 from . import fit as FIT
 from . import util
 from .profile import Profile
 
+_FIELD_NAME_INDEX = {}  # global_msg_num -> {field_name: field_profile}
+_ENUM_VALUES = {}  # profile type name -> {enum name: number key in Profile['types']}
+_FILE_HEADER = struct.Struct('<BBHI4s')  # File header without its CRC
+_CRC = struct.Struct('<H')
+_HEADER_SIZE = _FILE_HEADER.size + _CRC.size  # 14 byte header, including its CRC
+_PROFILE_VERSION = 21173  # 21.173, to match the original files
+# The CRC has no final XOR, so it is linear in the bytes: the header CRC is the CRC of bytes
+# 4-11 from zero XOR the CRC of the fixed first four bytes followed by eight zero bytes
+_HEADER_PREFIX_CRC = CrcCalculator.calculate_crc(
+    _FILE_HEADER.pack(_HEADER_SIZE, 0x02, _PROFILE_VERSION, 0, bytes(4)), 0, _FILE_HEADER.size)
+_FIT_EPOCH_DT = datetime.datetime.fromtimestamp(util.FIT_EPOCH_S, datetime.timezone.utc)  # 1989-12-31 00:00:00 UTC
+_VALUE_PACKERS = {type_code: struct.Struct('<' + type_code) for type_code in 'bBhHiIlLqQfd'}  # type_code -> Struct
+_VALUE_MASKS = {'B': 0xFF, 'H': 0xFFFF, 'i': 0xFFFFFFFF, 'I': 0xFFFFFFFF, 'l': 0xFFFFFFFF, 'L': 0xFFFFFFFF}
+_RAW_PACKERS = {1: _VALUE_PACKERS['B'], 2: _VALUE_PACKERS['H'], 4: _VALUE_PACKERS['L'], 8: _VALUE_PACKERS['Q']}  # size -> Struct
+_RAW_MASKS = {1: 0xFF, 2: 0xFFFF, 4: 0xFFFFFFFF}  # 8 byte values are packed unmasked
+# Base type properties indexed by base type number, so the per-value writers index a list
+# instead of fetching and subscripting a definition dict for every value
+_TYPE_CODES = [None] * 256
+_TYPE_SIZES = [0] * 256
+_TYPE_INVALIDS = [0] * 256
+for _base_type, _base_type_def in FIT.BASE_TYPE_DEFINITIONS.items():
+    _TYPE_CODES[_base_type] = _base_type_def['type_code']
+    _TYPE_SIZES[_base_type] = _base_type_def['size']
+    _TYPE_INVALIDS[_base_type] = _base_type_def['invalid']
+del _base_type, _base_type_def
+_UNMASKED_INT_CODES = frozenset('bhqQ')  # Integer type codes packed without a mask
+_ARRAY_PACKERS = {}  # (type_code, element count) -> Struct for a whole array
+# Inferred (base_type, size) for ints by bit length, below 32 bits; see _get_int_base_type
+_UINT32_TYPE = (FIT.BASE_TYPE['UINT32'], 4)
+_INT_TYPES_BY_BIT_LENGTH = ([(FIT.BASE_TYPE['SINT8'], 1)] * 8 + [(FIT.BASE_TYPE['UINT8'], 1)]
+                            + [(FIT.BASE_TYPE['SINT16'], 2)] * 7 + [(FIT.BASE_TYPE['UINT16'], 2)]
+                            + [(FIT.BASE_TYPE['SINT32'], 4)] * 15)
+_NEGATIVE_INT_TYPES_BY_BIT_LENGTH = ([(FIT.BASE_TYPE['SINT8'], 1)] * 8 + [(FIT.BASE_TYPE['SINT16'], 2)] * 8
+                                     + [(FIT.BASE_TYPE['SINT32'], 4)] * 16)
+_DEFINITION_PACKERS = {}  # field count -> Struct for a whole definition record
+_NON_FIELD_KEYS = frozenset(('mesg_num', 'developer_fields'))  # Message keys that are not regular fields
+_GLOBAL_MSG_NUMS = {msg_profile['messages_key']: global_msg_num
+                    for global_msg_num, msg_profile in Profile['messages'].items()}  # messages_key -> global_msg_num
+
+
+def _split_field_keys(keys) -> tuple:
+    '''Splits message keys into (field names, field numbers) in a single pass.
+
+    Decoded keys are exactly str or int, so the int test compares classes rather than
+    calling isinstance on every key.
+    '''
+    names = []
+    numbers = []
+    for key in keys:
+        if key.__class__ is int:
+            numbers.append(key)
+        elif isinstance(key, str):
+            names.append(key)
+    return names, numbers
+
+
+def _get_enum_values(field_type: str) -> dict:
+    '''Returns an enum name -> number key mapping for a profile type, or None if it is not a profile type.
+
+    The mappings are the reverse of Profile['types'], built once per type on first use,
+    so converting a string value back to its number is a dict lookup rather than a scan.
+    '''
+    enum_values = _ENUM_VALUES.get(field_type)
+    if enum_values is None:
+        type_values = Profile['types'].get(field_type)
+        if type_values is None:
+            return None
+
+        enum_values = {}
+        for num_val, str_val in type_values.items():
+            enum_values.setdefault(str_val, num_val)  # The first number wins, as in a forward scan
+        _ENUM_VALUES[field_type] = enum_values
+
+    return enum_values
+
+
+def _get_int_base_type(value: int) -> tuple:
+    '''
+    Returns the (base_type, size) of the smallest type that holds value, preferring signed
+    types: SINT8, UINT8, SINT16, UINT16, SINT32, and UINT32 for anything wider.
+    '''
+    # Non-negative values need bit_length() bits unsigned and one more signed; negative
+    # values need (~value).bit_length() bits plus the sign bit
+    if value >= 0:
+        bit_length = value.bit_length()
+        return _INT_TYPES_BY_BIT_LENGTH[bit_length] if bit_length < 32 else _UINT32_TYPE
+
+    bit_length = (~value).bit_length()
+    return _NEGATIVE_INT_TYPES_BY_BIT_LENGTH[bit_length] if bit_length < 32 else _UINT32_TYPE
+
+
+def _get_field_name_index(global_msg_num: int, msg_profile: dict) -> dict:
+    '''Returns a field name -> field profile mapping for the given message profile.
+
+    Indexes for profile messages are built once and cached; dynamic profiles for
+    unknown message types are indexed on every call since they are not shared.
+    '''
+    index = _FIELD_NAME_INDEX.get(global_msg_num)
+    if index is not None and msg_profile is Profile['messages'].get(global_msg_num):
+        return index
+
+    index = {field_profile['name']: field_profile for field_profile in msg_profile.get('fields', {}).values()}
+    if msg_profile is Profile['messages'].get(global_msg_num):
+        _FIELD_NAME_INDEX[global_msg_num] = index
+
+    return index
+
 
 class Encoder:
     '''
@@ -61,60 +170,47 @@ class Encoder:
         Returns:
             bytearray: The encoded FIT data
         '''
-        # Clear any previous data
-        self._data_buffer = bytearray()
+        # Clear any previous data. The buffer starts with a slot for the header, so the
+        # records are encoded straight into the output and never copied after encoding
+        self._data_buffer = bytearray(_HEADER_SIZE)
         self._local_mesg_defs = {}
         
         # Write all messages to data buffer
         self._write_messages()
         
-        # Create header
-        header = self._create_header(len(self._data_buffer))
+        # Fill in the header slot now that the data size is known
+        file_data = self._data_buffer
+        self._data_buffer = bytearray()
+        self._write_header(file_data, len(file_data) - _HEADER_SIZE)
         
         # Calculate CRC for the entire file
-        file_data = header + self._data_buffer
         crc = CrcCalculator.calculate_crc(file_data, 0, len(file_data))
-        crc_bytes = struct.pack('<H', crc)
+        file_data += _CRC.pack(crc)
         
-        return header + self._data_buffer + crc_bytes
+        return file_data
 
-    def _create_header(self, data_size: int) -> bytearray:
-        '''Create the FIT file header'''
-        header = bytearray()
-        
-        # Header size (14 bytes with CRC)
-        header.append(14)
-        
-        # Protocol version (2.0)
-        header.append(0x02)
-        
-        # Profile version (21.173 to match original)
-        profile_version = 21173
-        header.extend(struct.pack('<H', profile_version))
-        
-        # Data size
-        header.extend(struct.pack('<L', data_size))
-        
-        # Data type (".FIT")
-        header.extend(b'.FIT')
-        
-        # Calculate header CRC (first 12 bytes)
-        header_crc = CrcCalculator.calculate_crc(header, 0, 12)
-        header.extend(struct.pack('<H', header_crc))
-        
-        return header
+    def _write_header(self, file_data: bytearray, data_size: int):
+        '''Write the FIT file header into the slot reserved at the start of file_data'''
+        # Header size (14 bytes with CRC), protocol version (2.0),
+        # profile version, data size and data type (".FIT")
+        _FILE_HEADER.pack_into(file_data, 0, _HEADER_SIZE, 0x02, _PROFILE_VERSION, data_size, b'.FIT')
+        
+        # Calculate header CRC (first 12 bytes); only the data size and data type are
+        # run through the CRC, the fixed leading bytes are folded into _HEADER_PREFIX_CRC
+        header_crc = _HEADER_PREFIX_CRC ^ CrcCalculator.calculate_crc(file_data, 4, 12)
+        _CRC.pack_into(file_data, 12, header_crc)
 
     def _write_messages(self):
         '''Write all messages to the data buffer'''
-        # Pre-analyze all messages to determine consistent field types
-        all_messages = []
-        for messages in self._messages.values():
-            all_messages.extend(messages)
+        # Pre-analyze all messages to determine consistent field types. The messages are
+        # passed lazily, so no flattened copy of every message list is built up front
+        all_messages = chain.from_iterable(self._messages.values())
         self.field_type_definitions = self._analyze_field_types_across_messages(all_messages)
         
         # Write file_id message first (required by FIT spec)
-        if 'file_id_mesgs' in self._messages:
-            self._write_message_type(0, self._messages['file_id_mesgs'])
+        file_id_mesgs = self._messages.get('file_id_mesgs')
+        if file_id_mesgs is not None:
+            self._write_message_type(0, file_id_mesgs)
         
         # Write all other message types
         for msg_type, messages in self._messages.items():
@@ -127,9 +223,8 @@ class Encoder:
     def _write_message_type(self, message_type_num: int, messages: list):
         '''Write all messages of a specific type with smart field combination grouping'''
         # Check if this is a known message type with profile info
-        if message_type_num in Profile['messages']:
-            msg_profile = Profile['messages'][message_type_num]
-        else:
+        msg_profile = Profile['messages'].get(message_type_num)
+        if msg_profile is None:
             # Unknown message type - create a dynamic profile from field data
             msg_profile = self._create_dynamic_profile(message_type_num, messages)
         
@@ -142,8 +237,7 @@ class Encoder:
             return
         
         # Check if any messages have developer fields
-        has_dev_fields = any('developer_fields' in message and isinstance(message['developer_fields'], dict) 
-                           for message in messages)
+        has_dev_fields = any(isinstance(message.get('developer_fields'), dict) for message in messages)
         
         if has_dev_fields:
             # For messages with developer fields, use individual message definitions to avoid type conflicts
@@ -158,11 +252,10 @@ class Encoder:
         definition_cache = {}  # field_signature -> local_msg_num
         
         for message in messages:
-            # Skip 'mesg_num' as it's metadata
-            message_fields = set(field for field in message.keys() if field != 'mesg_num')
-            
-            # Create field signature based on exact fields present
-            field_signature = frozenset(message_fields)
+            # Create field signature based on exact fields present, skipping 'mesg_num' as it's metadata.
+            # The signature doubles as the field set for the definition, so it is only hashed once.
+            message_fields = frozenset(field for field in message if field != 'mesg_num')
+            field_signature = message_fields
             
             if field_signature in definition_cache:
                 # Reuse existing definition
@@ -186,27 +279,26 @@ class Encoder:
     def _write_developer_field_messages(self, global_msg_num: int, msg_profile: dict, messages: list):
         '''Special handling for messages with developer fields to avoid type conflicts'''
         # Pre-analyze ALL values for each developer field to determine the widest required type
-        dev_field_values = {}  # dev_id -> list of all values
+        dev_field_values = defaultdict(list)  # dev_id -> list of all values
         
         # Also collect all values for regular fields to ensure consistent typing
-        regular_field_values = {}  # field_name/number -> list of all values
+        regular_field_values = defaultdict(list)  # field_name/number -> list of all values
         
         for message in messages:
             # Collect developer field values
-            if 'developer_fields' in message and isinstance(message['developer_fields'], dict):
-                for dev_id, dev_value in message['developer_fields'].items():
-                    if dev_id not in dev_field_values:
-                        dev_field_values[dev_id] = []
+            developer_fields = message.get('developer_fields')
+            if isinstance(developer_fields, dict):
+                for dev_id, dev_value in developer_fields.items():
+                    # Touch the entry even for None so every developer field gets a type
+                    values = dev_field_values[dev_id]
                     
                     if dev_value is not None:
                         # Always append the value as-is, whether it's a list or single value
-                        dev_field_values[dev_id].append(dev_value)
+                        values.append(dev_value)
             
             # Collect regular field values for unified type determination
             for field_name, field_value in message.items():
-                if field_name not in ['mesg_num', 'developer_fields'] and field_value is not None:
-                    if field_name not in regular_field_values:
-                        regular_field_values[field_name] = []
+                if field_value is not None and field_name not in _NON_FIELD_KEYS:
                     regular_field_values[field_name].append(field_value)
         
         # Determine the optimal type for each developer field based on ALL its values
@@ -216,8 +308,12 @@ class Encoder:
                 dev_field_patterns[dev_id] = 2  # Default UINT8
                 continue
             
+            # Classify by the distinct classes of the values, collected in one pass, instead
+            # of rescanning every value for each isinstance() test below
+            value_types = {v.__class__ for v in values}
+
             # Check if we have any arrays in the values
-            has_arrays = any(isinstance(v, list) for v in values)
+            has_arrays = any(issubclass(t, list) for t in value_types)
             
             if has_arrays:
                 # For arrays, we need to look at the element types, not the array type
@@ -230,9 +326,10 @@ class Encoder:
                 
                 # Determine type based on array elements
                 if all_elements:
-                    if all(isinstance(v, str) for v in all_elements):
+                    element_types = {v.__class__ for v in all_elements}
+                    if all(issubclass(t, str) for t in element_types):
                         dev_field_patterns[dev_id] = 7  # STRING (for string arrays)
-                    elif all(isinstance(v, int) for v in all_elements):
+                    elif all(issubclass(t, int) for t in element_types):
                         min_val, max_val = min(all_elements), max(all_elements)
                         print(f"Developer field {dev_id}: array with element range {min_val} to {max_val}")
                         
@@ -252,13 +349,13 @@ class Encoder:
                             else:
                                 field_type = 133  # SINT32
                         dev_field_patterns[dev_id] = field_type
-                    elif any(isinstance(v, float) for v in all_elements):
+                    elif any(issubclass(t, float) for t in element_types):
                         dev_field_patterns[dev_id] = 136  # FLOAT32
                     else:
                         dev_field_patterns[dev_id] = 7  # STRING fallback
                 else:
                     dev_field_patterns[dev_id] = 2  # Default UINT8
-            elif all(isinstance(v, int) for v in values):
+            elif all(issubclass(t, int) for t in value_types):
                 # Non-array integers
                 min_val, max_val = min(values), max(values)
                 print(f"Developer field {dev_id}: values range {min_val} to {max_val}")
@@ -285,9 +382,9 @@ class Encoder:
                 print(f"Assigned type {field_type} to developer field {dev_id}")
             else:
                 # Non-integer values
-                if all(isinstance(v, str) for v in values):
+                if all(issubclass(t, str) for t in value_types):
                     dev_field_patterns[dev_id] = 7  # STRING
-                elif any(isinstance(v, float) for v in values):
+                elif any(issubclass(t, float) for t in value_types):
                     dev_field_patterns[dev_id] = 136  # FLOAT32
                 else:
                     dev_field_patterns[dev_id] = 7  # Default to STRING
@@ -297,13 +394,14 @@ class Encoder:
         
         for message in messages:
             # Skip 'mesg_num' as it's metadata
-            message_fields = set(field for field in message.keys() if field != 'mesg_num')
-            
+            message_fields = frozenset(field for field in message if field != 'mesg_num')
+
             # Create field signature that includes developer field IDs and their expected types
-            field_signature = frozenset(message_fields)
-            if 'developer_fields' in message and isinstance(message['developer_fields'], dict):
-                dev_field_types = tuple((dev_id, dev_field_patterns.get(dev_id, 7)) 
-                                      for dev_id in sorted(message['developer_fields'].keys()))
+            field_signature = message_fields
+            developer_fields = message.get('developer_fields')
+            if isinstance(developer_fields, dict):
+                dev_field_types = tuple((dev_id, dev_field_patterns.get(dev_id, 7))
+                                      for dev_id in sorted(developer_fields))
                 field_signature = (field_signature, ('dev_types', dev_field_types))
             
             if field_signature in definition_cache:
@@ -314,11 +412,9 @@ class Encoder:
                 local_msg_num = self._next_local_msg_num
                 if self._next_local_msg_num >= 16:
                     # Try to find a non-conflicting slot
-                    for test_slot in range(16):
-                        if test_slot not in definition_cache.values():
-                            local_msg_num = test_slot
-                            break
-                    else:
+                    used_slots = set(definition_cache.values())
+                    local_msg_num = next((slot for slot in range(16) if slot not in used_slots), None)
+                    if local_msg_num is None:
                         print(f"WARNING: All slots occupied, reusing slot {self._next_local_msg_num % 16}")
                         local_msg_num = self._next_local_msg_num % 16
                 else:
@@ -358,7 +454,7 @@ class Encoder:
                     sample_message['developer_fields'] = sample_dev_fields
                 
                 # Write message definition for this specific field combination  
-                print(f"Writing definition for slot {local_msg_num} with dev field types: {[(dev_id, dev_field_patterns.get(dev_id)) for dev_id in sample_message.get('developer_fields', {}).keys()]}")
+                print(f"Writing definition for slot {local_msg_num} with dev field types: {[(dev_id, dev_field_patterns.get(dev_id)) for dev_id in sample_message.get('developer_fields', {})]}")
                 print(f"Sample developer_fields: {sample_message.get('developer_fields', {})}")
                 self._write_specific_message_definition(local_msg_num, global_msg_num, msg_profile, message_fields, sample_message, dev_field_patterns)
             
@@ -392,10 +488,6 @@ class Encoder:
         
         self._next_local_msg_num += 1
         
-        # Create a comprehensive field set that includes all possible fields
-        # Remove debug output and implement the fix
-        all_fields = set()
-        sample_message = {}
         # Component fields that should not be included if parent field exists
         # Disabled for now - let the decoder/test handle component filtering
         COMPONENT_EXCLUSIONS = {
@@ -408,76 +500,27 @@ class Encoder:
             # },
             # Add other component exclusions as needed
         }
-        
-        for message in messages:
-            message_fields = set(field for field in message.keys() 
-                               if field != 'mesg_num')
-            
-            # Filter out component fields if their parent exists
-            filtered_fields = set()
-            for field in message_fields:
-                is_component = False
-                for parent_field, components in COMPONENT_EXCLUSIONS.items():
-                    if field in components and parent_field in message_fields:
-                        is_component = True
-                        break
-                if not is_component:
-                    filtered_fields.add(field)
-            
-            all_fields.update(filtered_fields)
-            
-            # Collect sample values for type determination
-            for field_name, field_value in message.items():
-                if field_name != 'mesg_num' and field_value is not None:
-                    if field_name not in sample_message:
-                        sample_message[field_name] = []
-                    sample_message[field_name].append(field_value)
-        
-        # Instead of complex component detection, use a simpler approach:
-        # Only include fields that have meaningful (non-default) values consistently
-        
-        # Collect fields that appear with non-default values
-        field_value_counts = {}
+
+        # Single pass over the messages: collect sample values for type determination and
+        # the fields that carry a meaningful value in at least one message.
+        # For roundtrip compatibility, be less aggressive - only exclude completely empty fields
+        sample_message = defaultdict(list)
         meaningful_fields = set()
-        
+
         for message in messages:
             for field_name, field_value in message.items():
-                if field_name == 'mesg_num':
+                if field_name == 'mesg_num' or field_value is None:
                     continue
-                
-                # Skip component fields if their parent exists  
-                is_component = False
-                for parent_field, components in COMPONENT_EXCLUSIONS.items():
-                    if field_name in components and parent_field in message:
-                        is_component = True
-                        break
-                if is_component:
+
+                sample_message[field_name].append(field_value)
+
+                # Skip component fields if their parent exists; with no exclusions configured
+                # this is a single truth test rather than a generator per field
+                if COMPONENT_EXCLUSIONS and any(field_name in components and parent_field in message
+                                                for parent_field, components in COMPONENT_EXCLUSIONS.items()):
                     continue
-                    
-                if field_name not in field_value_counts:
-                    field_value_counts[field_name] = {'total': 0, 'meaningful': 0}
-                
-                field_value_counts[field_name]['total'] += 1
-                
-                # Check if value is meaningful (not default/invalid)
-                # For roundtrip compatibility, be less aggressive - only exclude completely empty fields
-                if field_value is not None:
-                    field_value_counts[field_name]['meaningful'] += 1
-        
-        # Only include fields that have meaningful values in at least 10% of messages
-        for field_name, counts in field_value_counts.items():
-            if counts['meaningful'] > 0:  # At least one meaningful value
                 meaningful_fields.add(field_name)
-        
-        # Debug: show filtering results for record messages  
-        # if msg_profile.get('name') == 'record':
-        #     print(f"DEBUG: All fields: {len(all_fields)}")
-        #     print(f"DEBUG: Meaningful fields: {len(meaningful_fields)}")
-        #     removed_fields = all_fields - meaningful_fields
-        #     if removed_fields:
-        #         removed_names = [str(f) for f in removed_fields if isinstance(f, str)]
-        #         print(f"DEBUG: Removed default-value fields: {sorted(removed_names)}")
-        
+
         # Update sample message to only include meaningful fields
         filtered_sample_message = {k: v for k, v in sample_message.items() if k in meaningful_fields}
         
@@ -488,109 +531,15 @@ class Encoder:
         for message in messages:
             self._write_message_data(local_msg_num, msg_profile, message)
 
-    def _get_message_field_pattern(self, message: dict) -> frozenset:
-        '''Get field pattern for a message to enable grouping by field combinations'''
-        return pattern_groups
-    
     def _get_message_field_pattern(self, message: dict) -> frozenset:
         '''Get the field pattern (signature) for a message'''
-        # Create a signature based on non-null field names (excluding numeric field IDs)
-        field_names = set()
-        for field_name, field_value in message.items():
-            if not isinstance(field_name, int) and field_value is not None:
-                field_names.add(field_name)
-        
-        return frozenset(field_names)
-
-    def _write_message_definition(self, local_msg_num: int, global_msg_num: int, msg_profile: dict, pattern_messages: list):
-        '''Write a message definition record for a specific field pattern'''
-        # Record header byte (0x40 = definition message)
-        record_header = 0x40 | (local_msg_num & 0x0F)
-        self._data_buffer.append(record_header)
-        
-        # Reserved byte
-        self._data_buffer.append(0)
-        
-        # Architecture (0 = little endian)
-        self._data_buffer.append(0)
-        
-        # Global message number
-        self._data_buffer.extend(struct.pack('<H', global_msg_num))
-        
-        # Use the field pattern from the first message in this group
-        # All messages in pattern_messages have the same field pattern
-        sample_message = pattern_messages[0]
-        field_names = [name for name, value in sample_message.items() 
-                      if not isinstance(name, int) and value is not None]
-        
-        # Build field definitions for this specific pattern
-        field_defs = []
-        field_name_to_id = {}
-        
-        print(f"Creating definition for pattern with {len(field_names)} fields")
-        
-        for field_name in sorted(field_names):  # Sort for consistent output            
-            if field_name in msg_profile['fields']:
-                field_profile = msg_profile['fields'][field_name]
-            else:
-                # Try to find field by name
-                field_profile = None
-                for field_id, fp in msg_profile['fields'].items():
-                    if fp['name'] == field_name:
-                        field_profile = fp
-                        break
-                
-                if field_profile is None:
-                    # Skip unknown fields that aren't in the profile
-                    # This prevents synthetic fields that the decoder can't understand
-                    continue
-            
-            # Store the field name to ID mapping
-            field_name_to_id[field_name] = field_profile['num']
-            
-            # Determine field size and base type from sample message
-            sample_value = sample_message[field_name]
-            base_type, size = self._determine_field_type_and_size(field_profile, sample_value, field_name)
-            field_defs.append({
-                'field_id': field_profile['num'],
-                'size': size,
-                'base_type': base_type
-            })
-        
-        print(f"DEBUG: Created {len(field_defs)} field definitions for local message {local_msg_num}")
-        
-        # Number of fields
-        self._data_buffer.append(len(field_defs))
-        
-        # Field definitions
-        for field_def in field_defs:
-            self._data_buffer.append(field_def['field_id'])
-            self._data_buffer.append(field_def['size'])
-            self._data_buffer.append(field_def['base_type'])
-        
-        # Store definition for later use
-        self._local_mesg_defs[local_msg_num] = {
-            'global_msg_num': global_msg_num,
-            'profile': msg_profile,
-            'field_defs': field_defs,
-            'field_name_to_id': field_name_to_id
-        }
+        # Create a signature based on non-null field names (excluding numeric field IDs);
+        # the cheaper None test runs first and ints are matched by exact class
+        return frozenset(field_name for field_name, field_value in message.items()
+                         if field_value is not None and field_name.__class__ is not int)
 
     def _write_specific_message_definition(self, local_msg_num: int, global_msg_num: int, msg_profile, message_fields: set, sample_message: dict, dev_field_patterns: dict = None):
         '''Write a message definition for a specific set of fields'''
-        # Definition header: 0100xxxx where xxxx is local message number
-        definition_header = 0x40 | (local_msg_num & 0x0F)
-        self._data_buffer.append(definition_header)
-        
-        # Reserved byte
-        self._data_buffer.append(0)
-        
-        # Architecture
-        self._data_buffer.append(0)  # Definition & Data Messages are little endian
-        
-        # Global message number (2 bytes, little endian)
-        self._data_buffer.extend(struct.pack('<H', global_msg_num))
-        
         # Create field definitions for the specific fields in this message
         field_defs = []
         field_name_to_id = {}
@@ -598,9 +547,11 @@ class Encoder:
         # Use the sample message values for type determination
         sample_values = sample_message
         
-        # Separate string field names from numeric developer field numbers  
-        string_fields = [f for f in message_fields if isinstance(f, str)]
-        numeric_fields = [f for f in message_fields if isinstance(f, int)]
+        # Field name -> profile lookup for this message type
+        field_name_index = _get_field_name_index(global_msg_num, msg_profile)
+
+        # Separate string field names from numeric developer field numbers
+        string_fields, numeric_fields = _split_field_keys(message_fields)
         
         # Process string fields first (regular fields)
         for field_name in sorted(string_fields):  # Sort for consistent output
@@ -727,12 +678,8 @@ class Encoder:
             
             if 'fields' in msg_profile:
                 # Look for field by name in the fields dict
-                field_profile = None
-                for field_info in msg_profile['fields'].values():
-                    if field_info['name'] == field_name:
-                        field_profile = field_info
-                        break
-                
+                field_profile = field_name_index.get(field_name)
+
                 if field_profile is not None:
                     field_id = field_profile['num']
                     field_name_to_id[field_name] = field_id
@@ -795,9 +742,11 @@ class Encoder:
                     # Use the sample_value array as template for structure
                     template_array = sample_value
                     
-                    # Determine type that can handle all values in all arrays
+                    # Determine type that can handle all values in all arrays. The column is
+                    # classified by its distinct element classes, collected by map() in C,
+                    # rather than by an isinstance() call per element
                     if all_array_values:
-                        if all(isinstance(v, int) for v in all_array_values):
+                        if all(issubclass(t, int) for t in set(map(type, all_array_values))):
                             # Integer array - choose based on full range
                             min_val = min(all_array_values)
                             max_val = max(all_array_values)
@@ -867,20 +816,14 @@ class Encoder:
                 })
                 field_name_to_id[field_num] = field_num
         
-        # Number of fields (1 byte)
-        self._data_buffer.append(len(field_defs))
-        
-        # Field definitions (3 bytes each)
+        # Validate base types before writing
         for field_def in field_defs:
-            # Validate base type before writing
             if field_def['base_type'] not in FIT.BASE_TYPE_DEFINITIONS:
                 print(f"ERROR: Invalid base type {field_def['base_type']} for field {field_def['field_id']}")
                 print(f"Valid base types: {list(FIT.BASE_TYPE_DEFINITIONS.keys())}")
                 raise ValueError(f"Invalid base type {field_def['base_type']}")
-                
-            self._data_buffer.append(field_def['field_id'])  # Field definition number
-            self._data_buffer.append(field_def['size'])       # Size in bytes
-            self._data_buffer.append(field_def['base_type'])  # Base type
+        
+        self._write_definition_record(local_msg_num, global_msg_num, field_defs)
         
         # Store the definition for later use when writing message data
         self._local_mesg_defs[local_msg_num] = {
@@ -889,31 +832,78 @@ class Encoder:
             'field_name_to_id': field_name_to_id
         }
 
+    def _compile_field_defs(self, msg_def: dict, msg_profile: dict) -> list:
+        '''
+        Resolves everything about a definition's fields that does not depend on the record
+        being written, once per definition rather than once per data record.
+
+        Returns:
+            list: (field_def, field_name, dev_field_id, field_profile, field_def_info) per field
+            definition, in definition order; field_name is None when the definition has no
+            name for the field, and dev_field_id is None for regular fields
+        '''
+        # Invert the definition's name -> id mapping once, keeping the first name mapped to
+        # each id, rather than scanning the whole mapping for every field definition
+        field_id_to_name = {}
+        for name, fid in msg_def.get('field_name_to_id', {}).items():
+            field_id_to_name.setdefault(fid, name)
+        field_type_definitions = getattr(self, 'field_type_definitions', {})
+        field_name_index = _get_field_name_index(msg_def['global_msg_num'], msg_profile)
+
+        compiled = []
+        for field_def in msg_def['field_defs']:
+            # Find field name using our mapping
+            field_name = field_id_to_name.get(field_def['field_id'])
+            
+            dev_field_id = None
+            if isinstance(field_name, str) and field_name.startswith('developer_field_'):
+                # Developer field definitions carry their original ID, so the name only needs
+                # parsing when the definition slot belongs to a regular field with the same ID
+                dev_field_id = field_def.get('original_dev_field_id')
+                if dev_field_id is None:
+                    dev_field_id = int(field_name.split('_')[-1])
+            
+            # Look up field profile and array analysis by name
+            field_profile = field_name_index.get(field_name, {})
+            field_def_info = field_type_definitions.get(field_name)
+            compiled.append((field_def, field_name, dev_field_id, field_profile, field_def_info))
+
+        return compiled
+
+    def _write_definition_record(self, local_msg_num: int, global_msg_num: int, field_defs: list):
+        '''Write a definition record for field_defs, packed with a single Struct call'''
+        packer = _DEFINITION_PACKERS.get(len(field_defs))
+        if packer is None:
+            # Record header, reserved, architecture, global message number and field count,
+            # then field number, size and base type per field
+            packer = _DEFINITION_PACKERS[len(field_defs)] = struct.Struct('<BBBHB' + 'BBB' * len(field_defs))
+        
+        # Definition header: 0100xxxx where xxxx is local message number; the architecture
+        # byte is 0 as Definition & Data Messages are little endian
+        self._data_buffer.extend(packer.pack(
+            0x40 | (local_msg_num & 0x0F), 0, 0, global_msg_num, len(field_defs),
+            *chain.from_iterable((field_def['field_id'], field_def['size'], field_def['base_type'])
+                                 for field_def in field_defs)))
+
     def _write_message_data(self, local_msg_num: int, msg_profile: dict, message: dict):
         '''Write a message data record'''
         # Record header (normal message)
         record_header = local_msg_num & 0x0F
         self._data_buffer.append(record_header)
         
-        # Get field definitions
+        # Get field definitions, resolved once per definition; a redefined slot gets a new
+        # definition dict and so is compiled again
         msg_def = self._local_mesg_defs[local_msg_num]
+        compiled_fields = msg_def.get('compiled_fields')
+        if compiled_fields is None:
+            compiled_fields = msg_def['compiled_fields'] = self._compile_field_defs(msg_def, msg_profile)
 
-            # Write field data in the order defined in the message definition
-        for field_def in msg_def['field_defs']:
-            field_id = field_def['field_id']
-            
-            # Find field name using our mapping
-            field_name = None
-            for name, fid in msg_def.get('field_name_to_id', {}).items():
-                if fid == field_id:
-                    field_name = name
-                    break
-            
+        developer_fields = message.get('developer_fields', {})
+
+        # Write field data in the order defined in the message definition
+        for field_def, field_name, dev_field_id, field_profile, field_def_info in compiled_fields:
             # Check if this is a developer field
-            if field_name and isinstance(field_name, str) and field_name.startswith('developer_field_'):
-                # Extract developer field ID and get value from developer_fields dict
-                dev_field_id = int(field_name.split('_')[-1])
-                developer_fields = message.get('developer_fields', {})
+            if dev_field_id is not None:
                 if dev_field_id in developer_fields:
                     field_value = developer_fields[dev_field_id]
                     if dev_field_id == 2:
@@ -922,29 +912,29 @@ class Encoder:
                     self._write_field_value(field_value, field_def['size'], field_def['base_type'], {})
                 else:
                     # Write invalid/default value for missing developer field
-                    invalid_value = FIT.BASE_TYPE_DEFINITIONS[field_def['base_type']]['invalid']
+                    invalid_value = _TYPE_INVALIDS[field_def['base_type']]
                     self._write_field_bytes(invalid_value, field_def['size'], field_def['base_type'])
                 continue
             
-            # Fallback to profile lookup if not found in our mapping
+            # Fallback to profile lookup if not found in our mapping. Profile fields are keyed
+            # by number, so only a numbered field of the message can match the definition
             if field_name is None:
-                for fname, fvalue in message.items():
-                    if fname in msg_profile['fields'] and msg_profile['fields'][fname]['num'] == field_id:
-                        field_name = fname
-                        break
+                field_id = field_def['field_id']
+                if field_id in message and field_id in msg_profile['fields']:
+                    field_name = field_id
+                    field_profile = _get_field_name_index(msg_def['global_msg_num'], msg_profile).get(field_name, {})
+                    field_def_info = getattr(self, 'field_type_definitions', {}).get(field_name)
             
             if field_name is None or field_name not in message:
                 # Write invalid/default value
-                invalid_value = FIT.BASE_TYPE_DEFINITIONS[field_def['base_type']]['invalid']
+                invalid_value = _TYPE_INVALIDS[field_def['base_type']]
                 self._write_field_bytes(invalid_value, field_def['size'], field_def['base_type'])
             else:
                 # Write actual field value
                 field_value = message[field_name]
                 
                 # Check if field type analysis says this should be an array
-                if hasattr(self, 'field_type_definitions') and field_name in self.field_type_definitions:
-                    field_def_info = self.field_type_definitions[field_name]
-                    
+                if field_def_info is not None:
                     if field_def_info['is_array'] and not isinstance(field_value, list):
                         # Convert scalar to array with expected size
                         array_size = field_def_info['array_size']
@@ -955,30 +945,19 @@ class Encoder:
                         field_value = field_value[0] if field_value else 0
                         print(f"Converting array to scalar {field_value} for field {field_name}")
                 
-                # Look up field profile by searching for the field with matching name
-                field_profile = {}
-                for fid, finfo in msg_profile['fields'].items():
-                    if finfo.get('name') == field_name:
-                        field_profile = finfo
-                        break
                 self._write_field_value(field_value, field_def['size'], field_def['base_type'], field_profile)
 
     def _write_field_value(self, value, size: int, base_type: int, field_profile: dict):
         '''Write a field value with proper encoding'''
-        base_type_def = FIT.BASE_TYPE_DEFINITIONS[base_type]
-        
         if base_type == FIT.BASE_TYPE['STRING']:
             # String field - handle both single strings and string arrays
             if isinstance(value, list):
-                # String array - concatenate with null separators
-                concatenated = b''
-                for item in value:
-                    if item is not None:
-                        item_bytes = str(item).encode('utf-8') + b'\x00'
-                        concatenated += item_bytes
+                # String array - concatenate with null separators, joined in one allocation
+                # rather than copying the growing bytes object for every item
+                concatenated = b''.join(str(item).encode('utf-8') + b'\x00' for item in value if item is not None)
                 # Pad or truncate to fit size
                 if len(concatenated) < size:
-                    concatenated += b'\x00' * (size - len(concatenated))
+                    concatenated = concatenated.ljust(size, b'\x00')
                 else:
                     concatenated = concatenated[:size-1] + b'\x00'
                 self._data_buffer.extend(concatenated[:size])
@@ -986,7 +965,7 @@ class Encoder:
                 string_bytes = value.encode('utf-8')
                 # Pad or truncate to fit size
                 if len(string_bytes) < size:
-                    string_bytes += b'\x00' * (size - len(string_bytes))
+                    string_bytes = string_bytes.ljust(size, b'\x00')
                 else:
                     string_bytes = string_bytes[:size-1] + b'\x00'
                 self._data_buffer.extend(string_bytes[:size])
@@ -996,89 +975,128 @@ class Encoder:
         
         elif isinstance(value, (list, tuple)):
             # Array field
-            element_size = base_type_def['size']
-            num_elements = size // element_size
+            num_elements = size // _TYPE_SIZES[base_type]
+            if self._write_int_array(value, num_elements, base_type, field_profile):
+                return
             for i in range(num_elements):
                 if i < len(value):
                     self._write_single_value(value[i], base_type, field_profile)
                 else:
-                    self._write_single_value(base_type_def['invalid'], base_type, field_profile)
+                    self._write_single_value(_TYPE_INVALIDS[base_type], base_type, field_profile)
         
         else:
             # Single value
             self._write_single_value(value, base_type, field_profile)
 
+    def _write_int_array(self, value, num_elements: int, base_type: int, field_profile: dict) -> bool:
+        '''
+        Writes an array of plain ints with a single Struct call, padding it with the base
+        type's invalid value.
+
+        Only arrays that _write_single_value would write unchanged element by element are
+        handled: integer base types, no reverse scale or offset to apply and int elements.
+
+        Returns:
+            bool: True if the array was written, False if it needs the per-element path
+        '''
+        type_code = _TYPE_CODES[base_type]
+        if type_code not in _VALUE_MASKS and type_code not in _UNMASKED_INT_CODES:
+            return False
+        if field_profile:
+            scales = field_profile.get('scale')
+            offsets = field_profile.get('offset')
+            if (scales is not None and offsets is not None and len(scales) == 1 and len(offsets) == 1
+                    and (scales[0] != 1 or offsets[0] != 0)):
+                return False
+
+        values = list(value[:num_elements])
+        if not all(element.__class__ is int for element in values):
+            return False
+        values.extend([_TYPE_INVALIDS[base_type]] * (num_elements - len(values)))
+        mask = _VALUE_MASKS.get(type_code)
+        if mask is not None:
+            values = [element & mask for element in values]
+
+        packer = _ARRAY_PACKERS.get((type_code, num_elements))
+        if packer is None:
+            packer = _ARRAY_PACKERS[(type_code, num_elements)] = struct.Struct('<' + type_code * num_elements)
+        try:
+            packed = packer.pack(*values)
+        except struct.error:
+            # An element is out of range; the per-element path writes it as invalid
+            return False
+
+        self._data_buffer.extend(packed)
+        return True
+
     def _write_single_value(self, value, base_type: int, field_profile: dict):
         '''Write a single field value'''
         
-        base_type_def = FIT.BASE_TYPE_DEFINITIONS[base_type]
-        type_code = base_type_def['type_code']
+        type_code = _TYPE_CODES[base_type]
+        invalid = _TYPE_INVALIDS[base_type]
         
         # Handle datetime objects - convert back to FIT timestamp
         if isinstance(value, datetime.datetime):
             # Convert datetime back to FIT timestamp (seconds since FIT epoch)
             # FIT epoch is 1989-12-31 00:00:00 UTC
-            fit_timestamp = int(value.timestamp()) - util.FIT_EPOCH_S
-            value = fit_timestamp
-        
-        # Apply reverse scale and offset if we have profile info
-        if field_profile and 'scale' in field_profile and 'offset' in field_profile:
-            if len(field_profile['scale']) == 1 and len(field_profile['offset']) == 1:
-                scale = field_profile['scale'][0]
-                offset = field_profile['offset'][0]
+            if value.tzinfo is None:
+                # Naive datetimes are local time, which only timestamp() resolves
+                value = int(value.timestamp()) - util.FIT_EPOCH_S
+            else:
+                # Aware datetimes, as the decoder produces, are subtracted from the epoch
+                # directly, which is plain integer arithmetic on the timedelta's fields
+                delta = value - _FIT_EPOCH_DT
+                value = delta.days * 86400 + delta.seconds
+        
+        # Apply reverse scale and offset if we have profile info. Only numeric values are
+        # scaled, so None is ruled out before any profile lookup, and each list is fetched once
+        if value is not None and field_profile:
+            scales = field_profile.get('scale')
+            offsets = field_profile.get('offset')
+            if scales is not None and offsets is not None and len(scales) == 1 and len(offsets) == 1:
+                scale = scales[0]
+                offset = offsets[0]
                 if scale != 1 or offset != 0:
-                    # Only apply scaling to numeric values, not None
-                    if value is not None:
-                        # The correct formula depends on whether there's an offset
-                        if offset == 0:
-                            # For zero offset: decoder = raw / scale, so encoder = actual * scale
-                            value = round(value * scale)
-                        else:
-                            # For non-zero offset: decoder = (raw / scale) - offset, so encoder = (actual + offset) * scale
-                            value = round((value + offset) * scale)
+                    # The correct formula depends on whether there's an offset
+                    if offset == 0:
+                        # For zero offset: decoder = raw / scale, so encoder = actual * scale
+                        value = round(value * scale)
+                    else:
+                        # For non-zero offset: decoder = (raw / scale) - offset, so encoder = (actual + offset) * scale
+                        value = round((value + offset) * scale)
         
         # Convert strings back to numbers if needed
         if isinstance(value, str) and base_type != FIT.BASE_TYPE['STRING']:
             # Try to convert string enum values back to numbers
             if field_profile and 'type' in field_profile:
-                field_type = field_profile['type']
-                if field_type in Profile['types']:
+                enum_values = _get_enum_values(field_profile['type'])
+                if enum_values is not None:
                     # Find the numeric value for this string
-                    for num_val, str_val in Profile['types'][field_type].items():
-                        if str_val == value:
-                            value = int(num_val)
-                            break
-                    else:
-                        value = base_type_def['invalid']
+                    num_val = enum_values.get(value)
+                    value = int(num_val) if num_val is not None else invalid
         
         # Pack the value
         try:
             # Handle None values
             if value is None:
-                self._write_field_bytes(base_type_def['invalid'], base_type_def['size'], base_type)
+                self._write_field_bytes(invalid, _TYPE_SIZES[base_type], base_type)
                 return
                 
-            if type_code == 'b':  # signed byte
-                packed = struct.pack('<b', int(value))
-            elif type_code == 'B':  # unsigned byte
-                packed = struct.pack('<B', int(value) & 0xFF)
-            elif type_code == 'h':  # signed short
-                packed = struct.pack('<h', int(value))
-            elif type_code == 'H':  # unsigned short
-                packed = struct.pack('<H', int(value) & 0xFFFF)
-            elif type_code in ['i', 'I', 'l', 'L']:
-                packed = struct.pack('<' + type_code, int(value) & 0xFFFFFFFF)
-            elif type_code in ['q', 'Q']:
-                packed = struct.pack('<' + type_code, int(value))
-            elif type_code in ['f', 'd']:
-                packed = struct.pack('<' + type_code, float(value))
+            # Packers are compiled once per type code; unsigned and 32-bit integer types are
+            # masked to their width, signed 8/16-bit and 64-bit values are packed as is
+            packer = _VALUE_PACKERS.get(type_code)
+            if packer is None:
+                packed = _VALUE_PACKERS['B'].pack(invalid)
+            elif type_code == 'f' or type_code == 'd':
+                packed = packer.pack(float(value))
             else:
-                packed = struct.pack('<B', base_type_def['invalid'])
+                mask = _VALUE_MASKS.get(type_code)
+                packed = packer.pack(int(value) if mask is None else int(value) & mask)
             
             self._data_buffer.extend(packed)
         except (struct.error, ValueError, OverflowError, TypeError):
             # If packing fails, write invalid value
-            self._write_field_bytes(base_type_def['invalid'], base_type_def['size'], base_type)
+            self._write_field_bytes(invalid, _TYPE_SIZES[base_type], base_type)
 
     def _write_field_bytes(self, value, size: int, base_type: int):
         '''Write raw bytes for a field'''
@@ -1086,26 +1104,19 @@ class Encoder:
         if base_type is None or base_type not in FIT.BASE_TYPE_DEFINITIONS:
             # Fallback to UINT8 if base_type is invalid
             base_type = FIT.BASE_TYPE['UINT8']
-            
-        base_type_def = FIT.BASE_TYPE_DEFINITIONS[base_type]
-        type_code = base_type_def['type_code']
         
         try:
             # Handle None values defensively
             if value is None:
                 # Use the base type's invalid value
-                value = base_type_def['invalid']
+                value = _TYPE_INVALIDS[base_type]
             
-            if size == 1:
-                packed = struct.pack('<B', int(value) & 0xFF)
-            elif size == 2:
-                packed = struct.pack('<H', int(value) & 0xFFFF)
-            elif size == 4:
-                packed = struct.pack('<L', int(value) & 0xFFFFFFFF)
-            elif size == 8:
-                packed = struct.pack('<Q', int(value))
-            else:
+            packer = _RAW_PACKERS.get(size)
+            if packer is None:
                 packed = bytes([int(value) & 0xFF] * size)
+            else:
+                mask = _RAW_MASKS.get(size)
+                packed = packer.pack(int(value) if mask is None else int(value) & mask)
             
             self._data_buffer.extend(packed)
         except (struct.error, ValueError):
@@ -1117,9 +1128,12 @@ class Encoder:
         if field_value == 317:  # Debug specific case
             print(f"DEBUG: _determine_field_type_and_size called with value 317, profile: {field_profile}")
         
-        # Check if this field has been pre-analyzed for array handling
-        if field_name and hasattr(self, 'field_type_definitions') and field_name in self.field_type_definitions:
-            field_def_info = self.field_type_definitions[field_name]
+        # Check if this field has been pre-analyzed for array handling. getattr() with a
+        # default avoids the AttributeError that hasattr() raises and catches internally
+        # whenever the encoder is used before _write_messages() has run
+        field_type_definitions = getattr(self, 'field_type_definitions', None)
+        field_def_info = field_type_definitions.get(field_name) if field_name and field_type_definitions else None
+        if field_def_info is not None:
             if field_def_info['is_array']:
                 # For arrays, determine element type and multiply by array size
                 array_size = field_def_info['array_size']
@@ -1161,18 +1175,7 @@ class Encoder:
             elif isinstance(field_value, bool):
                 return FIT.BASE_TYPE['ENUM'], 1
             elif isinstance(field_value, int):
-                if -128 <= field_value <= 127:
-                    return FIT.BASE_TYPE['SINT8'], 1
-                elif 0 <= field_value <= 255:
-                    return FIT.BASE_TYPE['UINT8'], 1
-                elif -32768 <= field_value <= 32767:
-                    return FIT.BASE_TYPE['SINT16'], 2
-                elif 0 <= field_value <= 65535:
-                    return FIT.BASE_TYPE['UINT16'], 2
-                elif -2147483648 <= field_value <= 2147483647:
-                    return FIT.BASE_TYPE['SINT32'], 4
-                else:
-                    return FIT.BASE_TYPE['UINT32'], 4
+                return _get_int_base_type(field_value)
             elif isinstance(field_value, float):
                 return FIT.BASE_TYPE['FLOAT32'], 4
             else:
@@ -1181,16 +1184,12 @@ class Encoder:
         
         # Convert enum string values to numbers first
         if isinstance(field_value, str) and field_profile and 'type' in field_profile:
-            field_type = field_profile['type']
-            if field_type in Profile['types']:
+            enum_values = _get_enum_values(field_profile['type'])
+            if enum_values is not None:
                 # This is an enum field - convert string to number
-                for num_val, str_val in Profile['types'][field_type].items():
-                    if str_val == field_value:
-                        field_value = int(num_val)
-                        break
-                else:
-                    # Unknown enum value - use invalid
-                    field_value = 0  # Default to 0 for unknown enum values
+                num_val = enum_values.get(field_value)
+                # Unknown enum value - default to 0
+                field_value = int(num_val) if num_val is not None else 0
         
         if 'type' in field_profile and field_profile['type'] in FIT.FIELD_TYPE_TO_BASE_TYPE:
             base_type = FIT.FIELD_TYPE_TO_BASE_TYPE[field_profile['type']]
@@ -1223,20 +1222,9 @@ class Encoder:
             elif isinstance(field_value, float):
                 return FIT.BASE_TYPE['FLOAT32'], 4
             elif isinstance(field_value, int):
-                if -128 <= field_value <= 127:
-                    return FIT.BASE_TYPE['SINT8'], 1
-                elif 0 <= field_value <= 255:
-                    return FIT.BASE_TYPE['UINT8'], 1
-                elif -32768 <= field_value <= 32767:
-                    return FIT.BASE_TYPE['SINT16'], 2
-                elif 0 <= field_value <= 65535:
-                    if field_value == 317:  # Debug specific case
-                        print(f"DEBUG: Value 317 assigned UINT16")
-                    return FIT.BASE_TYPE['UINT16'], 2
-                elif -2147483648 <= field_value <= 2147483647:
-                    return FIT.BASE_TYPE['SINT32'], 4
-                else:
-                    return FIT.BASE_TYPE['UINT32'], 4
+                if field_value == 317:  # Debug specific case
+                    print(f"DEBUG: Value 317 assigned UINT16")
+                return _get_int_base_type(field_value)
             elif isinstance(field_value, (list, tuple)):
                 if field_value:
                     # Examine all elements to determine the required type range
@@ -1290,23 +1278,21 @@ class Encoder:
             return int(msg_type)
             
         # Look up known message types in profile
-        for global_num, msg_info in Profile['messages'].items():
-            if msg_info.get('messages_key') == msg_type:
-                return global_num
-        return None
+        return _GLOBAL_MSG_NUMS.get(msg_type)
 
     def _create_dynamic_profile(self, message_type_num: int, messages: list):
         '''Create a dynamic profile for unknown message types by analyzing field data'''
         # Collect all field numbers used across all messages of this type
         all_field_nums = set()
         field_value_examples = {}
+        add_field_num = all_field_nums.add
+        add_example = field_value_examples.setdefault  # Keeps the first value seen, one lookup per field
         
         for message in messages:
             for field_num, value in message.items():
                 if field_num != 'mesg_num':  # Skip metadata
-                    all_field_nums.add(field_num)
-                    if field_num not in field_value_examples:
-                        field_value_examples[field_num] = value
+                    add_field_num(field_num)
+                    add_example(field_num, value)
         
         # Create dynamic field definitions
         fields = {}
@@ -1374,6 +1360,9 @@ class Encoder:
         }
     
     def _analyze_field_types_across_messages(self, messages):
-        """Pre-analyze all messages to determine consistent field types for specific problematic fields."""
+        """Pre-analyze all messages to determine consistent field types for specific problematic fields.
+
+        messages may be any iterable of messages and is iterated at most once.
+        """
         # Disable pre-analysis to allow individual message field definitions
         return {}
\ No newline at end of file
@@ -8,7 +8,10 @@ This script takes a FIT file path as an argument and performs:
 3. Encode the modified data structure to a new FIT file
 
 Usage:
-    python3 process_fit_file.py <input_file.fit> [output_file.fit]
+    python3 process_fit_file.py [--strict] <input_file.fit> [output_file.fit]
+
+The decoder verifies the file CRC while reading. --strict additionally checks the header
+CRC and declared file size before decoding.
 '''
 
 import sys
@@ -18,12 +21,14 @@ from pathlib import Path
 from garmin_fit_sdk import Decoder, Encoder, Stream
 
 
-def decode_fit_file(input_path):
+def decode_fit_file(input_path, strict=False):
     """
     Decode a FIT file into a message data structure.
     
     Args:
         input_path (str): Path to the input FIT file
+        strict (bool): Check the header CRC and declared size before decoding. The
+            decode itself verifies the file CRC, so the file data is still read once.
         
     Returns:
         tuple: (messages_dict, success_bool)
@@ -47,11 +52,12 @@ def decode_fit_file(input_path):
         print("✓ Valid FIT file format")
         
         # Check integrity
-        stream.reset()
-        if not decoder.check_integrity():
-            print("❌ File failed integrity check")
-            return None, False
-        print("✓ File passed integrity check")
+        if strict:
+            stream.reset()
+            if not decoder.check_header_integrity():
+                print("❌ File header failed integrity check")
+                return None, False
+            print("✓ File header passed integrity check")
         
         # Decode messages
         stream.reset()
@@ -65,8 +71,7 @@ def decode_fit_file(input_path):
         total_messages = sum(len(msgs) for msgs in messages.values())
         print(f"✓ Successfully decoded {len(messages)} message types ({total_messages} total messages)")
         
-        for msg_type, msgs in messages.items():
-            print(f"  - {msg_type}: {len(msgs)} messages")
+        print("\n".join(f"  - {msg_type}: {len(msgs)} messages" for msg_type, msgs in messages.items()))
             
         return messages, True
         
@@ -133,8 +138,12 @@ def encode_fit_file(messages, output_path):
         # Encode to file
         result = encoder.write_to_file(output_path)
         
-        if result and os.path.exists(output_path):
-            file_size = os.path.getsize(output_path)
+        try:
+            file_size = os.stat(output_path).st_size if result else None
+        except FileNotFoundError:
+            file_size = None
+
+        if file_size is not None:
             print(f"✓ Encoding completed successfully")
             print(f"✓ Output file size: {file_size} bytes")
             return True
@@ -151,14 +160,16 @@ def main():
     """Main function to handle command line arguments and orchestrate the processing"""
     
     # Parse command line arguments
-    if len(sys.argv) < 2:
-        print("Usage: python3 process_fit_file.py <input_file.fit> [output_file.fit]")
+    strict = '--strict' in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg != '--strict']
+    if len(args) < 1:
+        print("Usage: python3 process_fit_file.py [--strict] <input_file.fit> [output_file.fit]")
         print("\nExample:")
         print("  python3 process_fit_file.py tests/fits/ActivityDevFields.fit output.fit")
         sys.exit(1)
     
-    input_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else f"processed_{os.path.basename(input_file)}"
+    input_file = args[0]
+    output_file = args[1] if len(args) > 1 else f"processed_{os.path.basename(input_file)}"
     
     print("🚀 FIT File Processing")
     print("=" * 30)
@@ -166,7 +177,7 @@ def main():
     print(f"Output: {output_file}")
     
     # Step 1: Decode original file
-    messages, success = decode_fit_file(input_file)
+    messages, success = decode_fit_file(input_file, strict)
     if not success:
         sys.exit(1)
     
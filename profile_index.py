@@ -0,0 +1,23 @@
+'''profile_index.py: Precomputed Profile lookups shared by the debug scripts.'''
+
+from garmin_fit_sdk.profile import Profile
+
+MESSAGES_BY_NAME = {}  # message name -> (global_msg_num, message profile)
+
+# The profile's fields are not generated in numeric order; sort once here rather than in every listing
+SORTED_FIELDS_BY_MSG = {}  # global_msg_num -> [(field_id, field_profile)] in field id order
+
+for _msg_num, _msg_profile in Profile['messages'].items():
+    MESSAGES_BY_NAME[_msg_profile['name']] = (_msg_num, _msg_profile)
+    SORTED_FIELDS_BY_MSG[_msg_num] = sorted(_msg_profile['fields'].items())
+del _msg_num, _msg_profile
+
+
+def find_message(name):
+    '''
+    Looks up a message profile by message name.
+
+    Returns:
+        tuple: (global_msg_num, message profile), or (None, None) if the name is unknown
+    '''
+    return MESSAGES_BY_NAME.get(name, (None, None))
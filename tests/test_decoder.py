@@ -45,6 +45,34 @@ class TestCheckIntegrity:
 
         assert decoder.check_integrity() is False
 
+    @pytest.mark.parametrize(
+        "data,expected_value",
+        [
+            (bytearray(), False),
+            (Data.fit_file_invalid, False),
+            (Data.fit_file_minimum, True),
+            (Data.fit_file_short, True),
+            (Data.fit_file_short[:-1] + bytearray([Data.fit_file_short[-1] ^ 0xFF]), True),
+            (Data.fit_file_incorrect_data_size, False)
+        ], ids=["Empty File", "Invalid Fit File", "Minimum Size Fit File",
+                "Fit File with Messages", "Bad File CRC", "Incorrect Data Size"]
+    )
+    def test_check_header_integrity(self, data, expected_value):
+        '''Tests that the header check validates the header without checking the file CRC.'''
+        stream = Stream.from_byte_array(data)
+        decoder = Decoder(stream)
+        assert decoder.check_header_integrity() == expected_value
+
+    def test_check_header_integrity_leaves_stream_readable(self):
+        '''Tests that a read after the header check needs no stream reset.'''
+        stream = Stream.from_byte_array(Data.fit_file_short)
+        decoder = Decoder(stream)
+
+        assert decoder.check_header_integrity() is True
+        messages, errors = decoder.read()
+        assert len(errors) == 0
+        assert len(messages['file_id_mesgs']) == 1
+
     @pytest.mark.parametrize(
         "data,expected_value",
         [
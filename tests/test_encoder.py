@@ -9,6 +9,8 @@ from datetime import datetime, timezone
 import pytest
 from garmin_fit_sdk import Decoder, Encoder, Stream
 from garmin_fit_sdk import fit as FIT
+from garmin_fit_sdk.encoder import _get_field_name_index
+from garmin_fit_sdk.profile import Profile
 
 
 class TestEncoder:
@@ -259,4 +261,14 @@ class TestEncoder:
         
         # The difference should be FIT_EPOCH_S
         expected_diff = fit_epoch_dt.timestamp() - unix_epoch_dt.timestamp()
-        assert abs(expected_diff - FIT_EPOCH_S) < 1, f"FIT_EPOCH_S mismatch: expected {expected_diff}, got {FIT_EPOCH_S}"
\ No newline at end of file
+        assert abs(expected_diff - FIT_EPOCH_S) < 1, f"FIT_EPOCH_S mismatch: expected {expected_diff}, got {FIT_EPOCH_S}"
+
+    def test_field_name_index_matches_profile(self):
+        '''Tests that the cached field name index resolves the same profiles as a linear scan'''
+        record_profile = Profile['messages'][20]
+        index = _get_field_name_index(20, record_profile)
+
+        for field_profile in record_profile['fields'].values():
+            assert index[field_profile['name']] is field_profile
+
+        assert _get_field_name_index(20, record_profile) is index
@@ -20,34 +20,34 @@ class TestFieldProfileDebug:
         }
         
         # Debug the field definition creation
-        original_write_message_definition = Encoder._write_message_definition
+        original_write_message_definition = Encoder._write_specific_message_definition
         
-        def debug_write_message_definition(self, local_msg_num, global_msg_num, msg_profile, sample_message):
+        def debug_write_message_definition(self, local_msg_num, global_msg_num, msg_profile, message_fields, sample_message, dev_field_patterns=None):
             print(f"DEBUG: Writing message definition for message: {sample_message.keys()}")
             print(f"  Message profile name: {msg_profile.get('name', 'UNKNOWN')}")
             print(f"  Available profile fields: {list(msg_profile.get('fields', {}).keys())}")
             
+            # Index the profile fields by name once per definition rather than scanning them per field
+            fields_by_name = {field_profile.get('name'): field_profile
+                              for field_profile in msg_profile.get('fields', {}).values()}
+            
             # Check specifically for software_version
             for field_name in sample_message.keys():
                 if field_name == 'software_version':
                     print(f"  Checking software_version field...")
                     
                     # Look for it in profile fields
-                    profile_field = None
-                    for field_num, field_profile in msg_profile['fields'].items():
-                        if field_profile.get('name') == 'software_version':
-                            profile_field = field_profile
-                            break
+                    profile_field = fields_by_name.get('software_version')
                     
                     if profile_field:
                         print(f"    Found in profile: {profile_field}")
                     else:
                         print(f"    NOT FOUND in profile - will be synthetic")
             
-            return original_write_message_definition(self, local_msg_num, global_msg_num, msg_profile, sample_message)
+            return original_write_message_definition(self, local_msg_num, global_msg_num, msg_profile, message_fields, sample_message, dev_field_patterns)
         
         # Monkey patch for debugging
-        Encoder._write_message_definition = debug_write_message_definition
+        Encoder._write_specific_message_definition = debug_write_message_definition
         
         try:
             encoder = Encoder(test_messages)
@@ -65,4 +65,4 @@ class TestFieldProfileDebug:
             
         finally:
             # Restore original method
-            Encoder._write_message_definition = original_write_message_definition
\ No newline at end of file
+            Encoder._write_specific_message_definition = original_write_message_definition
\ No newline at end of file
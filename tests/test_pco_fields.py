@@ -4,8 +4,11 @@
 import os
 import tempfile
 import unittest
+from collections import defaultdict
 from garmin_fit_sdk import Decoder, Encoder
 
+PCO_FIELDS = frozenset(('left_pco', 'right_pco'))
+
 
 class TestPCOFields(unittest.TestCase):
     """Test that PCO fields are preserved through encode/decode cycles"""
@@ -30,13 +33,18 @@ class TestPCOFields(unittest.TestCase):
         
         if 'record_mesgs' in cls.original_messages:
             print(f"Found {len(cls.original_messages['record_mesgs'])} record messages")
+            sorted_fields = {}  # field set -> sorted field names
             for i, record in enumerate(cls.original_messages['record_mesgs'][:10]):  # Check first 10
-                print(f"Record {i}: {sorted(record.keys())}")
-                if 'left_pco' in record and 'right_pco' in record:
+                field_set = frozenset(record)
+                if field_set not in sorted_fields:
+                    sorted_fields[field_set] = sorted(field_set)
+                print(f"Record {i}: {sorted_fields[field_set]}")
+                # Key views compare as sets, so each test is one C-level call per record
+                if PCO_FIELDS <= record.keys():
                     cls.pco_record = record
                     cls.pco_record_index = i
                     break
-                elif 'left_pco' in record or 'right_pco' in record:
+                elif not PCO_FIELDS.isdisjoint(record):
                     print(f"  ^ Has partial PCO fields")
         else:
             print("No 'record_mesgs' key in original messages")
@@ -180,26 +188,18 @@ class TestPCOFields(unittest.TestCase):
         records = self.original_messages['record_mesgs']
         
         # Analyze field patterns
-        patterns = {}
+        patterns = defaultdict(list)  # pattern -> indices of records with that pattern
         for i, record in enumerate(records):
             # Create field pattern (sorted field names)
-            field_names = [name for name in record.keys() if not isinstance(name, int)]
+            field_names = [name for name in record if name.__class__ is str]
             pattern = tuple(sorted(field_names))
-            
-            if pattern not in patterns:
-                patterns[pattern] = {
-                    'count': 0,
-                    'indices': [],
-                    'sample_record': record
-                }
-            patterns[pattern]['count'] += 1
-            patterns[pattern]['indices'].append(i)
+            patterns[pattern].append(i)
         
         print(f"\nFound {len(patterns)} different field patterns in {len(records)} records:")
-        for i, (pattern, info) in enumerate(patterns.items()):
-            print(f"  Pattern {i+1}: {info['count']} records, {len(pattern)} fields")
+        for i, (pattern, indices) in enumerate(patterns.items()):
+            print(f"  Pattern {i+1}: {len(indices)} records, {len(pattern)} fields")
             print(f"    Fields: {list(pattern)}")
-            print(f"    Sample indices: {info['indices'][:5]}{'...' if len(info['indices']) > 5 else ''}")
+            print(f"    Sample indices: {indices[:5]}{'...' if len(indices) > 5 else ''}")
             
             # Check if this pattern has PCO fields
             has_pco = 'left_pco' in pattern and 'right_pco' in pattern
@@ -104,13 +104,17 @@ class TestPCOFieldsManual(unittest.TestCase):
             
             # Analyze each decoded record
             pco_found = False
+            sorted_fields = {}  # field set -> sorted field names, records mostly share a few sets
             for i, decoded_record in enumerate(decoded_records):
                 has_left = 'left_pco' in decoded_record
                 has_right = 'right_pco' in decoded_record
                 has_pco = has_left and has_right
                 
                 print(f"  Decoded record {i}: {len(decoded_record)} fields, PCO={has_pco}")
-                print(f"    Fields: {sorted(decoded_record.keys())}")
+                field_set = frozenset(decoded_record)
+                if field_set not in sorted_fields:
+                    sorted_fields[field_set] = sorted(field_set)
+                print(f"    Fields: {sorted_fields[field_set]}")
                 
                 if has_pco:
                     pco_found = True
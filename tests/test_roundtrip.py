@@ -1,11 +1,29 @@
 '''test_roundtrip.py: Contains integration tests for round-trip encode/decode operations'''
 
 
+import functools
 import os
 import tempfile
 
 import pytest
 from garmin_fit_sdk import Decoder, Encoder, Stream
+from garmin_fit_sdk.profile import Profile
+
+
+_PROFILES_BY_MESSAGES_KEY = {profile['messages_key']: profile for profile in Profile['messages'].values()}
+
+
+@functools.lru_cache(maxsize=None)
+def _component_field_names(message_type):
+    '''Returns the names of the fields in message_type that are components of another field'''
+    msg_profile = _PROFILES_BY_MESSAGES_KEY.get(message_type)
+    if msg_profile is None:
+        return frozenset()
+
+    fields = msg_profile['fields']
+    component_to_parent = {child: parent_id for parent_id, parent in fields.items()
+                           if parent.get('has_components') for child in (parent.get('components') or ())}
+    return frozenset(field['name'] for field_id, field in fields.items() if field_id in component_to_parent)
 
 
 class TestRoundTrip:
@@ -126,40 +144,7 @@ class TestRoundTrip:
     
     def _is_component_field(self, field_name, message_type):
         '''Check if a field is a component field that gets expanded from a parent field'''
-        from garmin_fit_sdk.profile import Profile
-        
-        # Get message profile
-        msg_num = None
-        for num, msg_profile in Profile['messages'].items():
-            if msg_profile.get('messages_key') == message_type:
-                msg_num = num
-                break
-        
-        if msg_num is None:
-            return False
-            
-        msg_profile = Profile['messages'][msg_num]
-        
-        # Find the field profile by name
-        field_profile = None
-        for field_id, fp in msg_profile['fields'].items():
-            if fp['name'] == field_name:
-                field_profile = fp
-                break
-        
-        if field_profile is None:
-            return False
-        
-        field_num = field_profile['num']
-        
-        # Check if any other field has this field as a component
-        for parent_id, parent_fp in msg_profile['fields'].items():
-            if (parent_fp.get('has_components', False) and 
-                'components' in parent_fp and 
-                field_num in parent_fp['components']):
-                return True
-                
-        return False
+        return field_name in _component_field_names(message_type)
 
     def _compare_single_message(self, original, decoded, ignore_fields, context):
         '''Helper method to compare individual messages'''